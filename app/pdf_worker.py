@@ -0,0 +1,14 @@
+"""PDF page extraction run in worker processes.
+
+Kept apart from the Streamlit script so that worker processes only import this module
+and PyPDF2, not the whole app.
+"""
+import io
+
+import PyPDF2
+
+
+def extract_page_range(pdf_bytes, start, stop):
+    """Extract the text of pages [start, stop)"""
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
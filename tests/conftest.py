@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+
+# main.py is a script, not a package: make it importable from the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Chainable stand-in for a Supabase query; execute() is one round trip"""
+
+    def __init__(self, client, name, params=None):
+        self.client = client
+        self.name = name
+        self.params = params
+        self.filters = []
+
+    def __getattr__(self, method):
+        # select, eq, in_, order, limit, or_, ... only shape the request
+        def chain(*args, **kwargs):
+            self.filters.append((method, args))
+            return self
+        return chain
+
+    def execute(self):
+        self.client.calls.append(self.name)
+        time.sleep(self.client.latency)
+        if self.name in self.client.failing:
+            raise Exception(f"{self.name} is unavailable")
+        return FakeResponse(self.client.handlers[self.name](self))
+
+
+class FakeSupabase:
+    """Counts the round trips the app makes; handlers map a table or RPC name to rows"""
+
+    def __init__(self, handlers, latency=0):
+        self.handlers = handlers
+        self.latency = latency
+        self.calls = []
+        self.failing = set()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeQuery(self, name, params)
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """Point the app at a FakeSupabase with an empty read cache of its own"""
+    import main
+
+    def install(handlers, latency=0):
+        client = FakeSupabase(handlers, latency)
+        cache = main.QueryCache(ttl=60, max_entries=100)
+        monkeypatch.setattr(main, "DB_BACKEND", "rest")
+        monkeypatch.setattr(main, "supabase", client)
+        monkeypatch.setattr(main, "get_query_cache", lambda: cache)
+        return client, cache
+    return install
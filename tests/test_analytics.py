@@ -0,0 +1,83 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import main
+
+ROLES = [("Backend Engineer", "technical"), ("Data Analyst", "technical"), ("Product Manager", "hr")]
+
+
+@pytest.fixture(scope="module")
+def rows():
+    """10k completed interviews with 10 answers each, 1 in 20 a placeholder 7"""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    interviews, questions = [], []
+    for interview_id in range(1, 10_001):
+        job_title, interview_type = rng.choice(ROLES)
+        interviews.append({
+            'id': interview_id, 'job_title': job_title, 'interview_type': interview_type,
+            'final_score': f"{rng.uniform(2, 10):.2f}",  # DECIMAL columns arrive as strings
+            'created_at': (start + timedelta(minutes=50 * interview_id)).isoformat()
+        })
+        for number in range(1, 11):
+            fallback = rng.random() < 0.05
+            questions.append({
+                'interview_id': interview_id, 'question_number': number,
+                'score': 7 if fallback else max(0, 10 - number + rng.randint(-1, 1)),
+                'score_fallback': fallback
+            })
+    return interviews, questions
+
+
+def test_aggregates_at_10k_interviews(rows):
+    start = time.perf_counter()
+    interviews, questions = main.build_analytics_frames(*rows)
+    summary = main.role_score_summary(interviews)
+    curve = main.difficulty_curve(questions)
+    trend = main.score_trend(interviews)
+    elapsed = time.perf_counter() - start
+    print(f"\n10k interviews, {len(questions):,} answers: aggregated in {elapsed * 1000:.0f} ms")
+
+    assert len(questions) == 100_000
+    assert summary['interviews'].sum() == 10_000
+    assert set(zip(summary['job_title'], summary['interview_type'])) == set(ROLES)
+    assert len(curve) == 2 * 10  # interview types x question numbers
+    assert trend['interviews'].sum() == 10_000
+    assert elapsed < 5
+
+
+def test_difficulty_curve_leaves_out_placeholder_scores(rows):
+    _, questions = main.build_analytics_frames(*rows)
+    curve = main.difficulty_curve(questions)
+
+    placeholders = sum(q['score_fallback'] for q in rows[1])
+    assert curve['answers'].sum() == len(rows[1]) - placeholders
+    # Question 10 scores 0-1; the placeholder 7s would pull its average up
+    last = curve[curve['question_number'] == 10]
+    assert (last['average'] <= 1).all()
+
+
+def test_difficulty_curve_treats_missing_flags_as_real_scores():
+    interviews, questions = main.build_analytics_frames(
+        [{'id': 1, 'job_title': "Engineer", 'interview_type': "technical",
+          'final_score': 6, 'created_at': "2024-01-01T00:00:00+00:00"}],
+        [{'interview_id': 1, 'question_number': 1, 'score': 6, 'score_fallback': None},
+         {'interview_id': 1, 'question_number': 1, 'score': 7, 'score_fallback': True}]
+    )
+    curve = main.difficulty_curve(questions)
+
+    assert curve[['average', 'answers']].values.tolist() == [[6.0, 1]]
+
+
+def test_render_time_at_10k_interviews(rows, monkeypatch):
+    monkeypatch.setattr(main.db, "get_analytics_rows", lambda: rows)
+
+    start = time.perf_counter()
+    main.show_analytics()
+    elapsed = time.perf_counter() - start
+    print(f"\nshow_analytics at 10k interviews: {elapsed * 1000:.0f} ms")
+
+    assert elapsed < 10
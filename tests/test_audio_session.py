@@ -0,0 +1,50 @@
+import time
+
+import main
+
+
+class FakeStream:
+    def __init__(self):
+        self.running = True
+
+    def start_stream(self):
+        self.running = True
+
+    def stop_stream(self):
+        self.running = False
+
+
+class FakeMicrophone:
+    opened = 0
+    closed = 0
+
+    def __enter__(self):
+        FakeMicrophone.opened += 1
+        self.stream = type("Stream", (), {"pyaudio_stream": FakeStream()})()
+        return self
+
+    def __exit__(self, *exc):
+        FakeMicrophone.closed += 1
+
+
+def test_idle_microphone_is_released_and_reopened(monkeypatch):
+    FakeMicrophone.opened = FakeMicrophone.closed = 0
+    monkeypatch.setattr(main.sr, "Microphone", FakeMicrophone)
+    session = main.AudioSession(idle_release=0.1)
+    session.ambient_energy = 100  # skip calibration
+
+    with session.recording():
+        pass
+    with session.recording():
+        pass
+    assert (FakeMicrophone.opened, FakeMicrophone.closed) == (1, 0)
+
+    time.sleep(0.3)
+    assert session.source is None
+    assert FakeMicrophone.closed == 1
+
+    with session.recording():
+        pass
+    assert FakeMicrophone.opened == 2
+    session.close()
+    assert FakeMicrophone.closed == 2
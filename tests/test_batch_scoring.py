@@ -0,0 +1,81 @@
+import json
+import re
+
+import main
+
+
+def qa_pairs(count):
+    return [{'number': n, 'question': f"Question {n}", 'answer': f"Answer {n}"} for n in range(1, count + 1)]
+
+
+def fake_evaluator(monkeypatch, batch_item):
+    """chat_completion stub: batch_item(number, attempt) gives each item of a batch response"""
+    calls = {'batches': [], 'single': []}
+
+    def completion(task, messages, **kwargs):
+        prompt = messages[-1]['content']
+        if task == 'evaluate':
+            calls['single'].append(re.search(r"Question: Question (\d+)", prompt).group(1))
+            return json.dumps({'score': 5, 'feedback': "Evaluated alone."})
+        numbers = [int(n) for n in re.findall(r"^Question (\d+):", prompt, re.MULTILINE)]
+        attempt = sum(1 for batch in calls['batches'] if set(batch) & set(numbers))
+        calls['batches'].append(numbers)
+        items = [batch_item(n, attempt) for n in numbers]
+        return json.dumps([item for item in items if item is not None])
+
+    monkeypatch.setattr(main, "llm_ready", lambda: True)
+    monkeypatch.setattr(main, "chat_completion", completion)
+    return calls
+
+
+def test_only_invalid_items_are_retried_then_evaluated_alone(monkeypatch):
+    def batch_item(number, attempt):
+        if number == 2 and attempt == 0:
+            return {'number': 2, 'score': 15, 'feedback': "Out of range."}
+        if number == 4 and attempt == 0:
+            return None  # left out of the response
+        if number == 5:
+            return {'number': 5, 'score': "ten", 'feedback': "Not a number."}
+        return {'number': number, 'score': 8, 'feedback': f"Feedback {number}."}
+
+    calls = fake_evaluator(monkeypatch, batch_item)
+
+    results = main.batch_evaluate_answers(qa_pairs(6), "JD", "technical", chunk_size=3, retries=1)
+
+    assert sorted(calls['batches']) == [[1, 2, 3], [2, 4, 5], [4, 5, 6]]
+    assert calls['single'] == ["5"]
+    assert results[1] == (8, "Feedback 1.", False)
+    assert results[2] == (8, "Feedback 2.", False)
+    assert results[4] == (8, "Feedback 4.", False)
+    assert results[5] == (5, "Evaluated alone.", False)
+    assert sorted(results) == [1, 2, 3, 4, 5, 6]
+
+
+def test_unparseable_chunk_is_retried_whole(monkeypatch):
+    monkeypatch.setattr(main.st, "warning", lambda message: None)
+    responses = iter(["Sorry, I cannot help with that.", None])
+
+    def completion(task, messages, **kwargs):
+        response = next(responses)
+        if response is None:
+            return json.dumps([{'number': n, 'score': 6, 'feedback': "Fine."} for n in (1, 2)])
+        return response
+
+    monkeypatch.setattr(main, "llm_ready", lambda: True)
+    monkeypatch.setattr(main, "chat_completion", completion)
+
+    results = main.batch_evaluate_answers(qa_pairs(2), "JD", "technical", chunk_size=5, retries=1)
+
+    assert results == {1: (6, "Fine.", False), 2: (6, "Fine.", False)}
+
+
+def test_items_for_other_questions_are_ignored(monkeypatch):
+    calls = fake_evaluator(
+        monkeypatch,
+        lambda number, attempt: {'number': number + 10, 'score': 8, 'feedback': "Wrong number."}
+    )
+
+    results = main.batch_evaluate_answers(qa_pairs(2), "JD", "technical", chunk_size=5, retries=0)
+
+    assert calls['single'] == ["1", "2"]
+    assert results == {1: (5, "Evaluated alone.", False), 2: (5, "Evaluated alone.", False)}
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+
+import main
+
+
+def make_context(turns=6):
+    context = main.ConversationContext("technical", "Resume text", "JD text",
+                                       total_questions=10, token_budget=10, keep_recent=2)
+    for i in range(turns):
+        context.add_turn(f"Question {i}", f"A long answer number {i} " * 10)
+    return context
+
+
+def test_failed_compaction_keeps_the_turns(monkeypatch):
+    def fake_completion(task, messages, **kwargs):
+        if task == 'summarize':
+            raise RuntimeError("rate limited")
+        return "What did you build next?"
+
+    monkeypatch.setattr(main, "llm_ready", lambda: True)
+    monkeypatch.setattr(main, "chat_completion", fake_completion)
+    context = make_context()
+
+    context.compact_in_background().result(timeout=5)
+    question, is_fallback = main.ask_ai_question(context, 7)
+
+    assert (question, is_fallback) == ("What did you build next?", False)
+    assert len(context.turns) == 6
+    assert context.summary == ""
+
+
+def test_question_generation_does_not_wait_for_compaction(monkeypatch):
+    release = threading.Event()
+
+    def fake_completion(task, messages, **kwargs):
+        if task == 'summarize':
+            release.wait(timeout=5)
+            return "Summary"
+        return "Next question"
+
+    monkeypatch.setattr(main, "llm_ready", lambda: True)
+    monkeypatch.setattr(main, "chat_completion", fake_completion)
+    context = make_context()
+
+    compaction = context.compact_in_background()
+    # A second answer while the summary is still running does not start another one
+    assert context.compact_in_background() is compaction
+    assert main.ask_ai_question(context, 7) == ("Next question", False)
+    assert not compaction.done()
+    assert context.summary == ""
+
+    release.set()
+    compaction.result(timeout=5)
+    assert context.summary == "Summary"
+    assert len(context.turns) == 2
+
+
+def test_compaction_folds_old_turns_into_summary(monkeypatch):
+    monkeypatch.setattr(main, "chat_completion", lambda task, messages, **kwargs: "Summary")
+    context = make_context()
+
+    context.compact()
+
+    assert context.summary == "Summary"
+    assert [q for q, _ in context.turns] == ["Question 4", "Question 5"]
+    context.messages(7)
+    assert set(context.prompt_tokens) == {7}
+
+
+def test_questions_for_the_bank_are_generated_without_the_resume(monkeypatch):
+    prompts = []
+
+    def fake_completion(task, messages, **kwargs):
+        prompts.append("\n".join(m['content'] for m in messages))
+        return "Describe a system you would design for this role."
+
+    monkeypatch.setattr(main, "llm_ready", lambda: True)
+    monkeypatch.setattr(main, "chat_completion", fake_completion)
+    monkeypatch.setattr(main, "get_question_bank", lambda: bank)
+    bank = main.QuestionBank(threshold=0.9)
+
+    first = main.ConversationContext("technical", "Led payments at Acme", "Backend engineer JD")
+    first.jd_hash, first.resume_embedding, first.shared_questions = "jd", [1.0, 0.0], 1
+    main.ask_ai_question(first, 1)
+    main.ask_ai_question(first, 2)
+
+    assert "Acme" not in prompts[0]
+    assert "Backend engineer JD" in prompts[0]
+    # Later questions are personalised again
+    assert "Acme" in prompts[1]
+
+    second = main.ConversationContext("technical", "Other resume", "Backend engineer JD")
+    second.jd_hash, second.resume_embedding, second.shared_questions = "jd", [0.99, 0.05], 1
+    question, is_fallback = main.ask_ai_question(second, 1)
+    assert question == "Describe a system you would design for this role."
+    assert len(prompts) == 2
+
+
+def flat_prompt_tokens(transcript, question_num, answered):
+    """Estimated tokens of the single prompt questions were generated from before
+    ConversationContext: both documents plus every earlier Q/A pair, each time"""
+    history = "".join(f"\nQ{i}: {q}\nA{i}: {a}\n" for i, (q, a) in enumerate(answered, 1))
+    prompt = (
+        f"You are conducting a {transcript['interview_type']} interview.\n\n"
+        f"Job Description:\n{transcript['jd']}\n\nCandidate's Resume:\n{transcript['resume']}\n\n"
+        f"\n\nPrevious Questions and Answers:\n{history}\n\n"
+        f"This is question {question_num} out of 10 questions total.\n\n"
+        + "Generate ONE relevant interview question. " * 12
+    )
+    return main.ConversationContext.estimate_tokens(prompt)
+
+
+def test_prompt_tokens_on_recorded_transcript(monkeypatch):
+    path = os.path.join(os.path.dirname(__file__), "data", "transcript.json")
+    with open(path) as f:
+        transcript = json.load(f)
+    summary = "The candidate leads a Python ledger service on PostgreSQL and Kafka. " * 8
+    monkeypatch.setattr(main, "chat_completion", lambda task, messages, **kwargs: summary)
+
+    context = main.ConversationContext(
+        transcript['interview_type'], transcript['resume'], transcript['jd'], total_questions=10,
+        token_budget=600, keep_recent=3
+    )
+    before, after = {}, {}
+    for question_num, (question, answer) in enumerate(transcript['turns'], 1):
+        context.messages(question_num)
+        after[question_num] = context.prompt_tokens[question_num]
+        before[question_num] = flat_prompt_tokens(transcript, question_num, transcript['turns'][:question_num - 1])
+        context.add_turn(question, answer)
+        context.compact_in_background().result(timeout=5)
+
+    print("\nquestion  before  after")
+    for question_num in before:
+        print(f"{question_num:8}  {before[question_num]:6}  {after[question_num]:5}")
+    print(f"   total  {sum(before.values()):6}  {sum(after.values()):5}")
+
+    assert context.summary == summary
+    # History growth stops at the budget instead of growing with every answer
+    assert after[10] < before[10]
+    assert after[10] - after[6] < before[10] - before[6]
+    assert sum(after.values()) < sum(before.values())
+
+
+def test_embedding_call_has_a_timeout(monkeypatch):
+    options = {}
+
+    class FakeEmbeddings:
+        def create(self, model, input):
+            return type("Response", (), {'data': [type("Item", (), {'embedding': [0.1, 0.2]})()]})()
+
+    class FakeClient:
+        embeddings = FakeEmbeddings()
+
+        def with_options(self, **kwargs):
+            options.update(kwargs)
+            return self
+
+    monkeypatch.setattr(main, "openai_client", FakeClient())
+
+    assert main.embed_text("Resume") == [0.1, 0.2]
+    assert options == {'timeout': main.EMBEDDING_TIMEOUT, 'max_retries': 1}
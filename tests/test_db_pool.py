@@ -0,0 +1,130 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+
+import main
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.conn.health_checks += 1
+        if self.conn.dead:
+            raise psycopg2.OperationalError("server closed the connection")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.dead = False
+        self.health_checks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+
+class FakeThreadedPool:
+    """Behaves like ThreadedConnectionPool: raises instead of waiting when exhausted"""
+
+    instances = []
+    failures = 0
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        if FakeThreadedPool.failures:
+            FakeThreadedPool.failures -= 1
+            raise psycopg2.OperationalError("could not connect to server")
+        self.maxconn = maxconn
+        self.idle = []
+        self.used = 0
+        self.opened = 0
+        self.lock = threading.Lock()
+        FakeThreadedPool.instances.append(self)
+
+    def getconn(self):
+        with self.lock:
+            if self.used >= self.maxconn:
+                raise psycopg2.pool.PoolError("connection pool exhausted")
+            self.used += 1
+            if self.idle:
+                return self.idle.pop()
+            self.opened += 1
+            return FakeConnection()
+
+    def putconn(self, conn, close=False):
+        with self.lock:
+            self.used -= 1
+            if not close:
+                self.idle.append(conn)
+
+
+@pytest.fixture(autouse=True)
+def fake_pool(monkeypatch):
+    FakeThreadedPool.instances = []
+    FakeThreadedPool.failures = 0
+    monkeypatch.setattr(main, "ThreadedConnectionPool", FakeThreadedPool)
+
+
+def test_checkouts_wait_for_a_free_connection_instead_of_failing():
+    pool = main.PostgresPool(1, 2, "postgresql://test", timeout=5)
+    errors = []
+
+    def use_connection():
+        try:
+            with pool.connection():
+                time.sleep(0.02)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=use_connection) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert FakeThreadedPool.instances[0].opened <= 2
+
+
+def test_pool_is_created_again_after_a_failed_connection_attempt():
+    pool = main.PostgresPool(1, 2, "postgresql://test")
+    FakeThreadedPool.failures = 1
+
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection():
+            pass
+    with pool.connection() as conn:
+        assert isinstance(conn, FakeConnection)
+
+
+def test_recently_used_connections_skip_the_health_check_and_dead_ones_are_replaced():
+    pool = main.PostgresPool(1, 1, "postgresql://test", healthcheck_idle=60)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as again:
+        assert again is first
+    assert first.health_checks == 0
+
+    # Idle past the threshold and dead: discarded for a new connection
+    pool.healthcheck_idle = 0
+    first.dead = True
+    with pool.connection() as replacement:
+        assert replacement is not first
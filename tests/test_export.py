@@ -0,0 +1,114 @@
+import csv
+import os
+
+import pyarrow.parquet as pq
+import pytest
+
+import main
+
+
+def sample_row(columns, row_id):
+    row = {column: f"{column} {row_id}" for column in columns}
+    row.update({
+        'id': row_id,
+        'interview_id': 1,
+        'question_number': row_id,
+        'final_score': 7.5,
+        'score': None if row_id % 2 else 6.0,
+        'question_fallback': False,
+        'score_fallback': None,
+        'start_time': None,
+        'completed_at': '2024-05-01T10:00:00+00:00',
+        'created_at': '2024-05-01T09:00:00.123456+00:00',
+        'updated_at': '2024-05-01T10:00:00+00:00',
+    })
+    return {column: row[column] for column in columns}
+
+
+@pytest.mark.parametrize("table", sorted(main.ExportJob.COLUMNS))
+def test_parquet_writer_handles_every_exported_column(tmp_path, table):
+    columns = main.ExportJob.COLUMNS[table]
+    path = tmp_path / f"{table}.parquet"
+    writer = main.ParquetPageWriter(str(path), columns)
+    writer.write([sample_row(columns, 1), sample_row(columns, 2)])
+    writer.write([sample_row(columns, 3)])
+    writer.close()
+
+    result = pq.read_table(path)
+    assert result.column_names == columns
+    assert result.num_rows == 3
+    assert pq.ParquetFile(path).num_row_groups == 2
+
+
+UNTIL = '2024-06-01T00:00:00+00:00'
+
+
+def export_tables(tables, queries):
+    """FakeSupabase handlers serving the tables with the filters ExportJob sends"""
+    def handler(table):
+        def serve(query):
+            queries.append((table, query.filters))
+            rows = tables[table]
+            for method, args in query.filters:
+                if method == 'gt':
+                    rows = [row for row in rows if row[args[0]] > args[1]]
+                elif method == 'lte':
+                    rows = [row for row in rows if row[args[0]] <= args[1]]
+                elif method == 'limit':
+                    rows = rows[:args[0]]
+            return rows
+        return serve
+    return {'export_watermark': lambda query: UNTIL, **{table: handler(table) for table in tables}}
+
+
+def test_export_pages_through_tables_and_saves_watermark(tmp_path, fake_supabase):
+    tables = {
+        table: [sample_row(columns, row_id) for row_id in range(1, 6)]
+        for table, columns in main.ExportJob.COLUMNS.items()
+    }
+    queries = []
+    client, _ = fake_supabase(export_tables(tables, queries))
+    job = main.ExportJob(output_dir=str(tmp_path), fmt="csv", page_size=2)
+    paths = job.run()
+
+    assert job.stats['interviews'] == 5 and job.stats['questions'] == 5
+    # Three full or partial pages plus the empty page that ends each table
+    assert client.calls.count('interviews') == 4 and client.calls.count('questions') == 4
+    with open(paths[0], newline='') as f:
+        assert [int(row['id']) for row in csv.DictReader(f)] == [1, 2, 3, 4, 5]
+    assert job.load_watermark() == UNTIL
+
+
+def test_incremental_export_filters_on_updated_at(tmp_path, fake_supabase):
+    since = '2024-05-10T00:00:00+00:00'
+    tables = {
+        table: [sample_row(columns, row_id) for row_id in range(1, 4)]
+        for table, columns in main.ExportJob.COLUMNS.items()
+    }
+    # Scored after the previous export, and updated after this export started
+    tables['questions'][0]['updated_at'] = '2024-05-20T00:00:00+00:00'
+    tables['questions'][1]['updated_at'] = '2024-06-02T00:00:00+00:00'
+    queries = []
+    fake_supabase(export_tables(tables, queries))
+    job = main.ExportJob(output_dir=str(tmp_path), fmt="csv", since=since)
+    job.run()
+
+    assert job.stats['interviews'] == 0
+    assert job.stats['questions'] == 1
+    for _, filters in queries:
+        assert ('lte', ('updated_at', UNTIL)) in filters
+        assert ('gt', ('updated_at', since)) in filters
+        assert ('order', ('id',)) in filters
+
+
+def test_new_export_dir_removes_expired_exports(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "EXPORT_TMP_ROOT", str(tmp_path))
+    old = main.new_export_dir()
+    (tmp_path / old / "interviews.csv").write_text("id\n")
+    recent = main.new_export_dir()
+    os.utime(old, (0, 0))
+
+    newest = main.new_export_dir()
+
+    assert not os.path.exists(old)
+    assert os.path.isdir(recent) and os.path.isdir(newest)
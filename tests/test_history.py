@@ -0,0 +1,87 @@
+import time
+
+import main
+
+INTERVIEW_COUNT = 200
+QUESTIONS_PER_INTERVIEW = 5
+LATENCY = 0.005
+
+INTERVIEWS = [
+    {'id': i, 'candidate_name': f'Candidate {i}', 'created_at': f'2024-01-01T00:{i // 60:02d}:{i % 60:02d}'}
+    for i in range(1, INTERVIEW_COUNT + 1)
+]
+QUESTIONS = [
+    {'interview_id': i, 'question_number': n}
+    for i in range(1, INTERVIEW_COUNT + 1) for n in range(1, QUESTIONS_PER_INTERVIEW + 1)
+]
+
+
+def search_interviews(query):
+    """Newest first, after the (created_at, id) cursor, like the SQL function"""
+    params = query.params
+    rows = sorted(INTERVIEWS, key=lambda i: (i['created_at'], i['id']), reverse=True)
+    if params['after_id'] is not None:
+        cursor = (params['after_created_at'], params['after_id'])
+        rows = [i for i in rows if (i['created_at'], i['id']) < cursor]
+    return rows[:params['page_size']]
+
+
+def questions(query):
+    for method, args in query.filters:
+        if method == 'in_':
+            column, values = args
+            return [q for q in QUESTIONS if q[column] in values]
+        if method == 'eq':
+            column, value = args
+            return [q for q in QUESTIONS if q[column] == value]
+    return QUESTIONS
+
+
+def handlers():
+    return {
+        'search_interviews': search_interviews,
+        'questions': questions,
+        'interviews': lambda query: INTERVIEWS,
+    }
+
+
+def test_history_page_takes_two_round_trips(fake_supabase):
+    client, _ = fake_supabase(handlers(), latency=LATENCY)
+
+    start = time.perf_counter()
+    interviews, cursor = main.db.search_interviews(page_size=main.HISTORY_PAGE_SIZE)
+    by_interview = main.db.get_questions_for_interviews([i['id'] for i in interviews])
+    elapsed = time.perf_counter() - start
+
+    assert client.calls == ['search_interviews', 'questions']
+    assert len(interviews) == main.HISTORY_PAGE_SIZE
+    assert all(len(by_interview[i['id']]) == QUESTIONS_PER_INTERVIEW for i in interviews)
+    # One query per interview would take at least page size x latency
+    assert elapsed < main.HISTORY_PAGE_SIZE * LATENCY
+
+
+def test_pages_cover_every_interview_once(fake_supabase):
+    client, _ = fake_supabase(handlers())
+
+    seen = []
+    cursor = None
+    while True:
+        interviews, cursor = main.db.search_interviews(page_size=main.HISTORY_PAGE_SIZE, cursor=cursor)
+        main.db.get_questions_for_interviews([i['id'] for i in interviews])
+        seen.extend(i['id'] for i in interviews)
+        if cursor is None:
+            break
+
+    pages = -(-INTERVIEW_COUNT // main.HISTORY_PAGE_SIZE)
+    assert sorted(seen) == [i['id'] for i in INTERVIEWS]
+    assert len(client.calls) == 2 * pages
+
+
+def test_per_interview_loading_round_trips(fake_supabase):
+    """The loader this replaced: one questions query per interview"""
+    client, _ = fake_supabase(handlers())
+
+    for interview in main.db.get_all_interviews():
+        main.db.get_questions(interview['id'])
+
+    assert len(client.calls) == INTERVIEW_COUNT + 1
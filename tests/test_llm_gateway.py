@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+import main
+
+COMPLETION = {
+    'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': 'gpt-test',
+    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': 'hello'}, 'finish_reason': 'stop'}],
+    'usage': {'prompt_tokens': 3, 'completion_tokens': 1, 'total_tokens': 4},
+}
+MESSAGES = [{'role': 'user', 'content': 'hi'}]
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Local OpenAI chat completions endpoint that plays back (status, delay) per request"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeOpenAIHandler)
+        self.script = []
+        self.default = (200, 0)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def next_response(self):
+        with self.lock:
+            self.requests += 1
+            return self.script.pop(0) if self.script else self.default
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        status, delay = self.server.next_response()
+        time.sleep(delay)
+        body = json.dumps(COMPLETION if status == 200 else {'error': {'message': f'status {status}'}})
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode())
+        except OSError:
+            pass  # the client timed out and hung up
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = FakeOpenAIServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(main.LLMGateway, "_backoff", staticmethod(lambda attempt, error: 0))
+
+
+def gateway(server, timeout=2.0, **kwargs):
+    client = OpenAI(api_key='test', base_url=f'http://127.0.0.1:{server.server_port}/v1')
+    return main.LLMGateway(main.OpenAIProvider(client, timeout=timeout), **kwargs)
+
+
+def complete(llm):
+    return llm.complete(MESSAGES, 'gpt-test', max_tokens=10, temperature=0)
+
+
+def test_throttling_and_server_errors_are_retried(server):
+    server.script = [(429, 0), (503, 0)]
+    llm = gateway(server, max_retries=3, hedge_after=0)
+
+    assert complete(llm) == ('hello', (3, 1), None)
+    assert server.requests == 3
+    assert llm.stats['retries'] == 2
+    assert llm.breaker.state == 'closed'
+
+
+def test_timed_out_attempt_is_retried(server):
+    server.script = [(200, 1.0)]
+    llm = gateway(server, timeout=0.2, max_retries=1, hedge_after=0)
+
+    assert complete(llm)[0] == 'hello'
+    assert llm.stats['retries'] == 1
+
+
+def test_bad_request_is_not_retried(server):
+    server.default = (400, 0)
+    llm = gateway(server, max_retries=3, hedge_after=0)
+
+    with pytest.raises(main.openai.BadRequestError):
+        complete(llm)
+    assert server.requests == 1
+    assert llm.breaker.failures == 0
+
+
+def test_slow_call_is_hedged(server):
+    server.script = [(200, 1.5)]
+    llm = gateway(server, max_retries=0, hedge_after=0.1)
+
+    start = time.monotonic()
+    assert complete(llm)[0] == 'hello'
+    assert time.monotonic() - start < 1.0
+    assert llm.stats['hedges'] == 1
+    assert server.requests == 2
+
+
+def test_breaker_opens_then_lets_one_trial_through(server):
+    server.default = (500, 0)
+    breaker = main.CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    llm = gateway(server, max_retries=0, hedge_after=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(main.openai.InternalServerError):
+            complete(llm)
+    assert breaker.state == 'open'
+
+    with pytest.raises(main.CircuitOpenError):
+        complete(llm)
+    assert server.requests == 2
+    assert llm.stats['rejected'] == 1
+
+    time.sleep(0.25)
+    assert breaker.state == 'half-open'
+    server.default = (200, 0)
+    assert complete(llm)[0] == 'hello'
+    assert breaker.state == 'closed'
+
+
+def test_failed_trial_reopens_the_breaker(server):
+    server.default = (500, 0)
+    breaker = main.CircuitBreaker(failure_threshold=1, reset_timeout=0.2)
+    llm = gateway(server, max_retries=0, hedge_after=0, breaker=breaker)
+
+    with pytest.raises(main.openai.InternalServerError):
+        complete(llm)
+    time.sleep(0.25)
+    with pytest.raises(main.openai.InternalServerError):
+        complete(llm)
+    assert breaker.state == 'open'
@@ -0,0 +1,53 @@
+import main
+
+
+def test_routes_split_provider_and_model(monkeypatch):
+    monkeypatch.setitem(main.MODEL_ROUTES, 'evaluate', "anthropic:claude-sonnet-4-5")
+    monkeypatch.setitem(main.MODEL_ROUTES, 'question', "openai:gpt-4o")
+
+    assert main.resolve_route('evaluate') == ("anthropic", "claude-sonnet-4-5")
+    assert main.resolve_route('question') == ("openai", "gpt-4o")
+    # Unknown tasks use the question route
+    assert main.resolve_route('unknown') == ("openai", "gpt-4o")
+
+
+def test_anthropic_conversion_splits_system_and_merges_roles():
+    system, messages = main.AnthropicProvider._convert([
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": "Job description"},
+        {"role": "assistant", "content": "Understood."},
+        {"role": "system", "content": "Return JSON."},
+        {"role": "user", "content": "Summary so far"},
+        {"role": "user", "content": "Ask question 3."},
+    ])
+
+    assert system == "Be brief.\n\nReturn JSON."
+    assert messages == [
+        {"role": "user", "content": "Job description"},
+        {"role": "assistant", "content": "Understood."},
+        {"role": "user", "content": "Summary so far\n\nAsk question 3."},
+    ]
+
+
+def test_anthropic_conversion_does_not_modify_the_input():
+    original = [
+        {"role": "user", "content": "First"},
+        {"role": "user", "content": "Second"},
+    ]
+
+    _, messages = main.AnthropicProvider._convert(original)
+
+    assert messages == [{"role": "user", "content": "First\n\nSecond"}]
+    assert original[0]["content"] == "First"
+
+
+def test_conversation_context_messages_convert_cleanly():
+    context = main.ConversationContext("technical", "Resume", "JD", total_questions=10)
+    context.add_turn("Question 1", "Answer 1")
+
+    system, messages = main.AnthropicProvider._convert(context.messages(2, pending_question="Question 2"))
+
+    assert system == context.system_prompt()
+    roles = [m["role"] for m in messages]
+    assert all(a != b for a, b in zip(roles, roles[1:]))
+    assert roles[0] == "user" and roles[-1] == "user"
@@ -0,0 +1,104 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+
+
+def make_pdf(page_texts):
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode())
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def test_parallel_extraction_matches_serial(monkeypatch):
+    pdf = make_pdf([f"Page {i}" for i in range(20)])
+
+    monkeypatch.setattr(main, "PDF_PARALLEL_MIN_PAGES", 1000)
+    serial = main.extract_text_from_pdf(io.BytesIO(pdf))
+
+    calls = []
+    extract_parallel = main._extract_pages_parallel
+    monkeypatch.setattr(main, "PDF_PARALLEL_MIN_PAGES", 4)
+    monkeypatch.setattr(main, "_extract_pages_parallel",
+                        lambda *args: calls.append(args) or extract_parallel(*args))
+    parallel = main.extract_text_from_pdf(io.BytesIO(pdf))
+
+    assert "Page 0" in serial and "Page 19" in serial
+    assert parallel == serial
+    assert len(calls) == 1
+
+
+class CountingPool(ThreadPoolExecutor):
+    """Thread pool standing in for the process pool that counts submitted page ranges"""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.ranges = []
+
+    def submit(self, fn, pdf_bytes, start, stop):
+        self.ranges.append((start, stop))
+        return super().submit(fn, pdf_bytes, start, stop)
+
+
+def test_parallel_extraction_stops_at_the_character_cap(monkeypatch):
+    pool = CountingPool()
+    monkeypatch.setattr(main, "get_process_pool", lambda: pool)
+    monkeypatch.setattr(main, "PDF_WORKERS", 2)
+    monkeypatch.setattr(main, "PDF_PAGES_PER_TASK", 5)
+    pdf = make_pdf([f"Page {i} " + "x" * 90 for i in range(100)])
+
+    text = main.extract_text_from_pdf(io.BytesIO(pdf), max_pages=100, max_chars=1000)
+    pool.shutdown()
+
+    assert len(text) == 1000
+    assert text.startswith("Page 0 ")
+    # 1000 characters are on the first 10 pages: two ranges plus at most the ones in flight
+    assert len(pool.ranges) <= 4
+    assert pool.ranges[:2] == [(0, 5), (5, 10)]
+
+
+@pytest.mark.parametrize("page_count", [1, 10, 100])
+def test_extraction_benchmark(page_count):
+    pdf = make_pdf([f"Page {i} " + "lorem ipsum dolor sit amet " * 3 for i in range(page_count)])
+
+    # PDF_MAX_PAGES (50 by default) would cap the 100-page case
+    start = time.perf_counter()
+    text = main.extract_text_from_pdf(io.BytesIO(pdf), max_pages=page_count)
+    elapsed = time.perf_counter() - start
+
+    assert f"Page {page_count - 1} " in text
+    mode = "parallel" if page_count >= main.PDF_PARALLEL_MIN_PAGES else "serial"
+    print(f"{page_count} pages ({mode}): {elapsed * 1000:.1f} ms, {len(text)} chars")
+
+
+def test_worker_module_extracts_a_page_range():
+    import pdf_worker
+
+    pages = pdf_worker.extract_page_range(make_pdf(["Alpha", "Beta", "Gamma"]), 1, 3)
+    assert [page.strip() for page in pages] == ["Beta", "Gamma"]
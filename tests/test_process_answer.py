@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+
+import pytest
+
+import main
+
+LATENCY = 0.3
+
+
+def slow_completion(task, messages, on_text=None, **kwargs):
+    """Every LLM call takes LATENCY seconds"""
+    time.sleep(LATENCY)
+    if task == 'evaluate':
+        return json.dumps({'score': 8, 'feedback': "Clear and specific."})
+    return f"Question from {task}"
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Session state of an interview at question 1 of 10"""
+    monkeypatch.setattr(main, "llm_ready", lambda: True)
+    monkeypatch.setattr(main, "chat_completion", slow_completion)
+    state = main.st.session_state
+    state.interview_data = {'interview_type': 'technical', 'jd_prompt': "JD", 'scoring_mode': 'immediate'}
+    state.context = main.ConversationContext("technical", "Resume", "JD", total_questions=10)
+    state.total_questions = 10
+    state.current_question_num = 1
+    state.current_question = "Question 1"
+    state.speculative_mode = False
+    state.speculation = None
+    state.speculation_stats = {'hits': 0, 'misses': 0, 'latency_saved': 0.0}
+    return state
+
+
+def test_evaluation_and_next_question_run_concurrently(session):
+    start = time.perf_counter()
+    score, feedback, score_fallback, next_question = main.process_answer("Question 1", "Answer", 1)
+    elapsed = time.perf_counter() - start
+
+    assert (score, feedback, score_fallback) == (8, "Clear and specific.", False)
+    assert next_question == ("Question from question_early", False)
+    # One LLM latency, not one per call
+    assert LATENCY <= elapsed < 1.5 * LATENCY
+
+
+def test_last_answer_only_evaluates(session):
+    score, _, _, next_question = main.process_answer("Question 10", "Answer", 10)
+
+    assert score == 8
+    assert next_question is None
+
+
+def test_speculative_question_is_a_hit_and_saves_latency(session, monkeypatch):
+    tasks = []
+
+    def completion(task, messages, on_text=None, **kwargs):
+        tasks.append(task)
+        return slow_completion(task, messages, on_text=on_text, **kwargs)
+    monkeypatch.setattr(main, "chat_completion", completion)
+    monkeypatch.setattr(main, "SPECULATIVE_REFINE", False)
+    session.speculative_mode = True
+
+    main.start_speculation()
+    time.sleep(LATENCY + 0.1)  # the candidate answers while the question is generated
+    start = time.perf_counter()
+    _, _, _, next_question = main.process_answer("Question 1", "Answer", 1)
+    elapsed = time.perf_counter() - start
+
+    assert next_question == ("Question from question_early", False)
+    assert session.speculation_stats['hits'] == 1
+    assert session.speculation_stats['misses'] == 0
+    assert session.speculation_stats['latency_saved'] >= LATENCY
+    # Only the evaluation was left to wait for, and no second question was generated
+    assert elapsed < 1.5 * LATENCY
+    assert tasks.count('question_early') == 1
+
+
+def test_speculation_for_another_question_is_a_miss(session):
+    session.speculative_mode = True
+    main.start_speculation()
+
+    _, _, _, next_question = main.process_answer("A rephrased question", "Answer", 1)
+
+    assert next_question == ("Question from question_early", False)
+    assert session.speculation_stats == {'hits': 0, 'misses': 1, 'latency_saved': 0.0}
+    assert session.speculation is None
+
+
+def test_speculative_prompt_has_the_current_question_once(session, monkeypatch):
+    prompts = []
+
+    def completion(task, messages, on_text=None, **kwargs):
+        if task.startswith('question'):
+            prompts.append([m['content'] for m in messages])
+        return slow_completion(task, messages, on_text=on_text, **kwargs)
+    monkeypatch.setattr(main, "chat_completion", completion)
+    monkeypatch.setattr(main, "SPECULATIVE_REFINE", False)
+
+    # The speculative generation only builds its prompt after the answer was submitted
+    release = threading.Event()
+    timed_question = main._timed_question
+
+    def delayed(*args):
+        release.wait(timeout=5)
+        return timed_question(*args)
+    monkeypatch.setattr(main, "_timed_question", delayed)
+    session.speculative_mode = True
+    main.start_speculation()
+    threading.Timer(0.1, release.set).start()
+
+    main.process_answer("Question 1", "Answer", 1)
+
+    [prompt] = prompts
+    assert prompt.count("Question 1") == 1
+    assert "(candidate is still answering)" in prompt
+    assert "Answer" not in prompt
@@ -0,0 +1,86 @@
+import time
+
+import main
+
+INTERVIEWS = [
+    {'id': 2, 'candidate_name': 'B', 'created_at': '2024-01-02T00:00:00'},
+    {'id': 1, 'candidate_name': 'A', 'created_at': '2024-01-01T00:00:00'},
+]
+QUESTIONS = [
+    {'interview_id': 1, 'question_number': 1, 'score': 6},
+    {'interview_id': 2, 'question_number': 1, 'score': 8},
+]
+
+
+def handlers():
+    return {
+        'search_interviews': lambda query: INTERVIEWS,
+        'questions': lambda query: QUESTIONS,
+        'interview_score_summary': lambda query: [],
+        'save_interview_with_questions': lambda query: 3,
+    }
+
+
+def history_reads():
+    """The reads one rerun of the history page makes"""
+    interviews, _ = main.db.search_interviews(page_size=20)
+    main.db.get_questions_for_interviews([i['id'] for i in interviews])
+    main.db.get_score_summary()
+
+
+def saved_interview():
+    return {
+        'candidate_name': 'C', 'job_title': 'Engineer', 'interview_type': 'technical',
+        'final_score': 7.0, 'start_time': '2024-01-03T00:00:00', 'qa_pairs': []
+    }
+
+
+def test_warm_rerun_makes_no_network_calls(fake_supabase):
+    client, cache = fake_supabase(handlers())
+
+    history_reads()
+    assert len(client.calls) == 3
+
+    for _ in range(5):
+        history_reads()
+    assert len(client.calls) == 3
+    assert cache.stats['hits'] == 15
+
+
+def test_save_invalidates_cached_reads(fake_supabase):
+    client, cache = fake_supabase(handlers())
+    history_reads()
+
+    main.db.save_interview(saved_interview())
+    assert cache.stats['invalidations'] == 1
+    calls_before = len(client.calls)
+
+    history_reads()
+    assert len(client.calls) == calls_before + 3
+
+
+def test_failed_read_is_not_cached(fake_supabase, monkeypatch):
+    monkeypatch.setattr(main.st, "error", lambda message: None)
+    client, cache = fake_supabase(handlers())
+    client.failing.add('interview_score_summary')
+
+    assert main.db.get_score_summary() == []
+    client.failing.clear()
+    main.db.get_score_summary()
+    main.db.get_score_summary()
+
+    assert client.calls == ['interview_score_summary'] * 2
+
+
+def test_entries_expire_after_ttl():
+    cache = main.QueryCache(ttl=0.05, max_entries=10)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return len(loads), True
+
+    assert cache.get_or_load('key', load) == 1
+    assert cache.get_or_load('key', load) == 1
+    time.sleep(0.1)
+    assert cache.get_or_load('key', load) == 2
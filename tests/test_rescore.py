@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+
+
+class StubRescoreJob(main.RescoreJob):
+    """RescoreJob over an in-memory questions table; scoring fails for ids in failing"""
+
+    def __init__(self, questions, failing, **kwargs):
+        super().__init__(max_retries=0, **kwargs)
+        self.questions = questions
+        self.failing = failing
+        self.written = {}
+
+    def fetch_page(self, after_id):
+        return [q for q in self.questions if q['id'] > after_id][:self.page_size]
+
+    def fetch_questions(self, ids):
+        return [q for q in self.questions if q['id'] in ids]
+
+    def write_rows(self, rows):
+        self.written.update({row['id']: row['score'] for row in rows})
+
+    async def score(self, question):
+        if question['id'] in self.failing:
+            raise RuntimeError("rate limited")
+        return 8.0, "Good"
+
+
+@pytest.fixture
+def questions():
+    return [
+        {'id': i, 'interview_id': 1, 'question_number': i, 'question_text': "Q", 'answer': "A"}
+        for i in range(1, 8)
+    ]
+
+
+def test_failed_answers_are_kept_in_checkpoint_and_retried(tmp_path, monkeypatch, questions):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    job = StubRescoreJob(questions, failing={2, 5}, page_size=3, checkpoint_path=str(checkpoint_path))
+    assert not asyncio.run(job.run())
+    checkpoint = json.loads(checkpoint_path.read_text())
+    assert checkpoint['last_id'] == 7
+    assert checkpoint['failed_ids'] == [2, 5]
+    assert set(job.written) == {1, 3, 4, 6, 7}
+
+    # The next run retries only the failed answers, even though the pages are done
+    job = StubRescoreJob(questions, failing={5}, page_size=3, checkpoint_path=str(checkpoint_path))
+    assert not asyncio.run(job.run())
+    assert set(job.written) == {2}
+    assert json.loads(checkpoint_path.read_text())['failed_ids'] == [5]
+
+    job = StubRescoreJob(questions, failing=set(), page_size=3, checkpoint_path=str(checkpoint_path))
+    assert asyncio.run(job.run())
+    assert set(job.written) == {5}
+    assert json.loads(checkpoint_path.read_text())['failed_ids'] == []
+
+
+class ScoringRescoreJob(main.RescoreJob):
+    """RescoreJob over the real database code; every answer scores 9 except id 3"""
+
+    def __init__(self, **kwargs):
+        super().__init__(max_retries=0, **kwargs)
+        self.prompts = {}
+
+    async def score(self, question):
+        interview = self.interviews.get(question['interview_id'])
+        self.prompts[question['id']] = self.job_requirements(interview)
+        return (4.0 if question['id'] == 3 else 9.0), "Rescored"
+
+
+def test_rescore_updates_final_scores_and_uses_stored_jd(tmp_path, monkeypatch, fake_supabase):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    interviews = {
+        1: {'id': 1, 'job_title': 'Engineer', 'interview_type': 'technical', 'status': 'completed',
+            'final_score': 5.0, 'context': {'jd_prompt': 'Full JD'}},
+        2: {'id': 2, 'job_title': 'Analyst', 'interview_type': 'behavioral', 'status': 'in_progress',
+            'final_score': None, 'context': None},
+    }
+    questions = {
+        q['id']: q for q in [
+            {'id': 1, 'interview_id': 1, 'question_number': 1, 'question_text': "Q", 'answer': "A",
+             'score': 5.0, 'score_fallback': False},
+            {'id': 2, 'interview_id': 1, 'question_number': 2, 'question_text': "Q", 'answer': "A",
+             'score': 5.0, 'score_fallback': False},
+            {'id': 3, 'interview_id': 2, 'question_number': 1, 'question_text': "Q", 'answer': "A",
+             'score': 5.0, 'score_fallback': False},
+        ]
+    }
+
+    def filtered(query, rows):
+        for method, args in query.filters:
+            if method == 'gt':
+                rows = [r for r in rows if r[args[0]] > args[1]]
+            elif method == 'in_':
+                rows = [r for r in rows if r[args[0]] in args[1]]
+            elif method == 'limit':
+                rows = rows[:args[0]]
+        return rows
+
+    def questions_table(query):
+        if query.filters[0][0] == 'upsert':
+            for row in query.filters[0][1][0]:
+                questions[row['id']].update(row)
+            return []
+        return filtered(query, sorted(questions.values(), key=lambda q: q['id']))
+
+    def interviews_table(query):
+        if query.filters[0][0] == 'update':
+            values = query.filters[0][1][0]
+            interviews[query.filters[1][1][1]].update(values)
+            return []
+        return filtered(query, list(interviews.values()))
+
+    client, _ = fake_supabase({'questions': questions_table, 'interviews': interviews_table})
+    job = ScoringRescoreJob(page_size=2, checkpoint_path=str(tmp_path / "checkpoint.json"))
+    assert asyncio.run(job.run())
+
+    assert [q['score'] for q in questions.values()] == [9.0, 9.0, 4.0]
+    assert interviews[1]['final_score'] == 9.0
+    # In-progress interviews get their final score when they finish
+    assert interviews[2]['final_score'] is None
+    assert job.prompts == {1: 'Full JD', 2: 'Full JD', 3: 'Role: Analyst'}
+
+
+def test_final_score_leaves_out_placeholders():
+    assert main.final_score([{'score': 8}, {'score': 7, 'score_fallback': True}]) == 8
+    assert main.final_score([{'score': 7, 'score_fallback': True}]) == 7
+    assert main.final_score([{'score': None}]) is None
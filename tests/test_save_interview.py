@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+
+
+def interview(qa_count=3):
+    return {
+        'candidate_name': 'A', 'job_title': 'Engineer', 'interview_type': 'technical',
+        'final_score': 7.0, 'start_time': '2024-01-01T00:00:00',
+        'qa_pairs': [
+            {'number': n, 'question': f'Q{n}', 'answer': 'A', 'score': 7, 'feedback': 'ok'}
+            for n in range(1, qa_count + 1)
+        ]
+    }
+
+
+def missing_rpc(query):
+    raise Exception("PGRST202: Could not find the function save_interview_with_questions")
+
+
+def rest_tables(log):
+    def table(name):
+        def handler(query):
+            log.append((name, query.filters[0][0]))
+            return [{'id': 42}] if name == 'interviews' and query.filters[0][0] == 'insert' else []
+        return handler
+    return {'interviews': table('interviews'), 'questions': table('questions')}
+
+
+@pytest.fixture
+def errors(monkeypatch):
+    shown = []
+    monkeypatch.setattr(main.st, "error", shown.append)
+    return shown
+
+
+def test_save_is_one_round_trip(fake_supabase):
+    sent = []
+
+    def save(query):
+        sent.append(query.params)
+        return 42
+    client, _ = fake_supabase({'save_interview_with_questions': save})
+
+    assert main.db.save_interview(interview()) == 42
+    assert client.calls == ['save_interview_with_questions']
+    assert [q['question_number'] for q in sent[0]['questions']] == [1, 2, 3]
+
+
+def test_failed_questions_insert_deletes_interview_row(fake_supabase, errors):
+    log = []
+    client, _ = fake_supabase({'save_interview_with_questions': missing_rpc, **rest_tables(log)})
+    client.failing.add('questions')
+
+    assert main.db.save_interview(interview()) is None
+    assert log == [('interviews', 'insert'), ('interviews', 'delete')]
+    assert errors
+
+
+def test_failed_interview_insert_is_reported(fake_supabase, errors):
+    client, _ = fake_supabase({'save_interview_with_questions': missing_rpc, **rest_tables([])})
+    client.failing.add('interviews')
+
+    assert main.db.save_interview(interview()) is None
+    assert client.calls == ['save_interview_with_questions', 'interviews']
+    assert errors
+
+
+def test_failed_cleanup_is_reported(fake_supabase, errors):
+    client, _ = fake_supabase({'save_interview_with_questions': missing_rpc, **rest_tables([])})
+    client.failing.add('questions')
+    original = client.handlers['interviews']
+
+    def delete_fails(query):
+        if query.filters[0][0] == 'delete':
+            raise Exception("interviews delete timed out")
+        return original(query)
+    client.handlers['interviews'] = delete_fails
+
+    assert main.db.save_interview(interview()) is None
+    assert errors
+
+
+@pytest.mark.parametrize("concurrency", [1, 100, 1000])
+def test_concurrent_saves(fake_supabase, concurrency):
+    latency = 0.01
+    client, _ = fake_supabase({'save_interview_with_questions': lambda query: 1}, latency=latency)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(concurrency, 100)) as pool:
+        results = list(pool.map(lambda _: main.db.save_interview(interview(10)), range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    assert results == [1] * concurrency
+    assert len(client.calls) == concurrency
+    # Saves overlap: sequential saves would take concurrency x latency
+    assert elapsed < latency * max(concurrency // 10, 1) + 0.5
+    print(f"{concurrency} concurrent saves: {elapsed:.3f}s, {len(client.calls)} round trips")
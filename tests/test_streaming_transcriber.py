@@ -0,0 +1,83 @@
+import time
+from array import array
+from contextlib import nullcontext
+
+import main
+
+SAMPLE_RATE = 16000
+CHUNK_FRAMES = int(SAMPLE_RATE * main.SPEECH_CHUNK_SECONDS)
+SILENCE_CHUNKS = int(main.SPEECH_SILENCE_SECONDS / main.SPEECH_CHUNK_SECONDS)
+
+
+def pcm(amplitude):
+    return array('h', [amplitude] * CHUNK_FRAMES).tobytes()
+
+
+SPEECH, SILENCE = pcm(3000), pcm(50)
+
+
+class FakeStream:
+    """Plays back scripted chunks, then room noise in real time"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read(self, frames):
+        if self.chunks:
+            return self.chunks.pop(0)
+        time.sleep(main.SPEECH_CHUNK_SECONDS)
+        return SILENCE
+
+
+class FakeSource:
+    SAMPLE_RATE = SAMPLE_RATE
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, chunks):
+        self.stream = FakeStream(chunks)
+
+
+class FakeAudioSession(main.AudioSession):
+    """AudioSession whose microphone is a FakeSource, already calibrated to the room noise"""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self.recognizer.dynamic_energy_threshold = False
+        self.ambient_energy = 50
+        self.recognizer.energy_threshold = 50 * self.recognizer.dynamic_energy_ratio
+        self.fake_source = FakeSource(chunks)
+
+    def recording(self):
+        return nullcontext(self.fake_source)
+
+
+def test_segments_are_transcribed_as_they_end(monkeypatch):
+    monkeypatch.setattr(main, "SPEECH_RECOGNIZERS", dict(main.SPEECH_RECOGNIZERS))
+    words = iter(["hello there", "second thought"])
+    heard = []
+
+    def offline_recognizer(recognizer, audio):
+        heard.append(len(audio.frame_data) // (CHUNK_FRAMES * 2))
+        return next(words)
+    main.register_speech_recognizer("offline", offline_recognizer)
+
+    probe = int(main.AUDIO_DRIFT_PROBE_SECONDS / main.SPEECH_CHUNK_SECONDS)
+    chunks = (
+        [SILENCE] * probe
+        + [SPEECH] * 5 + [SILENCE] * SILENCE_CHUNKS
+        + [SPEECH] * 3 + [SILENCE] * SILENCE_CHUNKS
+    )
+    transcriber = main.StreamingTranscriber(FakeAudioSession(chunks), recognizer_name="offline").start()
+
+    deadline = time.monotonic() + 5
+    while len(transcriber.segments) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    transcriber.stop()
+
+    assert transcriber.segments == ["hello there", "second thought"]
+    assert transcriber.text == "hello there second thought"
+    # Each segment is its speech plus the silence that ended it
+    assert heard == [5 + SILENCE_CHUNKS, 3 + SILENCE_CHUNKS]
+    assert len(transcriber.latencies) == 2
+    assert all(0 <= latency < 1 for latency in transcriber.latencies)
+    assert transcriber.errors == []
@@ -0,0 +1,67 @@
+import threading
+
+import main
+
+
+class FlakyWriter:
+    """Records written rows; fails for the interviews in failing"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.written = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, interview_id, rows):
+        with self.lock:
+            self.calls += 1
+            if interview_id in self.failing:
+                raise RuntimeError("database unavailable")
+            for row in rows:
+                self.written[(interview_id, row['question_number'])] = row['answer']
+
+
+def row(number, answer="answer"):
+    return {'question_number': number, 'answer': answer}
+
+
+def test_flush_writes_buffered_rows_and_keeps_latest_version():
+    writer = FlakyWriter()
+    queue = main.WriteBehindQueue(writer, batch_size=100, flush_interval=5)
+    queue.put(1, row(1, "first"))
+    queue.put(1, row(2))
+    queue.put(1, row(1, "edited"))
+
+    assert queue.flush(1, timeout=5)
+    assert writer.written == {(1, 1): "edited", (1, 2): "answer"}
+    assert queue.pending(1) == 0
+
+
+def test_flush_reports_failure_when_rows_are_dropped():
+    writer = FlakyWriter(failing={1})
+    queue = main.WriteBehindQueue(writer, batch_size=100, flush_interval=0.05, max_retries=2)
+    queue.put(1, row(1))
+
+    assert not queue.flush(1, timeout=5)
+    assert queue.dropped(1) == {1}
+    assert queue.stats['dropped'] == 1
+
+    # Writing a newer version of the row clears it
+    writer.failing.clear()
+    queue.put(1, row(1, "retried"))
+    assert queue.flush(1, timeout=5)
+    assert queue.dropped(1) == set()
+
+
+def test_flush_is_not_held_up_by_another_interviews_failures():
+    writer = FlakyWriter(failing={1})
+    queue = main.WriteBehindQueue(writer, batch_size=100, flush_interval=2, max_retries=50)
+    queue.put(1, row(1))
+    queue.put(2, row(1))
+
+    assert queue.flush(2, timeout=1)
+    assert writer.written == {(2, 1): "answer"}
+    assert queue.pending(1) == 1
+
+    writer.failing.clear()
+    assert queue.flush(1, timeout=5)